@@ -0,0 +1,13 @@
+# Gunicorn configuration for production
+import os
+
+# Bind to all interfaces inside the container
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"  # nosec B104
+
+# gevent workers, each serving many concurrent connections. The default stays
+# small because the pod's CPU/memory limits (not the node's cores) bound it;
+# override with GUNICORN_WORKERS where more resources are allocated.
+workers = int(os.getenv('GUNICORN_WORKERS', 2))
+worker_class = 'gevent'
+worker_connections = 1000
+timeout = 60
@@ -1,55 +1,267 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import JSONProvider
+from prometheus_client import Counter, Histogram
+from prometheus_client.core import HistogramMetricFamily
+from prometheus_client.utils import floatToGoString
 from prometheus_flask_exporter import PrometheusMetrics
+from werkzeug.middleware.proxy_fix import ProxyFix
+import atexit
+import bisect
+import itertools
 import logging
-import json
+import orjson
 import os
+import queue
+import threading
 import time
 import uuid
+from collections import defaultdict, deque
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging: records are enqueued by a QueueHandler and written to
+# stderr by a QueueListener thread, so request threads never block on I/O.
+# This complements the batch buffer below: the buffer turns many request log
+# entries into one record, while the queue keeps the stream write itself off
+# whichever thread emits a record (including size-triggered batch flushes on
+# request threads and any other library loggers).
+# Like basicConfig, this leaves an already configured root logger alone.
+_root_logger = logging.getLogger()
+if not _root_logger.handlers:
+    _root_logger.setLevel(logging.INFO)
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    _log_queue = queue.SimpleQueue()
+    _log_listener = QueueListener(_log_queue, _log_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    _root_logger.addHandler(QueueHandler(_log_queue))
 logger = logging.getLogger(__name__)
 
+# Pre-bound callables used on every request (skips module attribute lookups)
+_time = time.time
+_monotonic = time.monotonic
+_dumps = orjson.dumps
+_loads = orjson.loads
+_uuid4 = uuid.uuid4
+_utcfromtimestamp = datetime.utcfromtimestamp
+
+# ISO-8601 UTC timestamp, formatted at most once per second. The (second, iso)
+# pair is replaced in a single assignment so concurrent readers never see a
+# half-updated entry.
+_ts_cache = (0, '')
+
+def _iso_now():
+    global _ts_cache
+    now = int(_time())
+    cached = _ts_cache
+    if cached[0] == now:
+        return cached[1]
+    iso = _utcfromtimestamp(now).isoformat()
+    _ts_cache = (now, iso)
+    return iso
+
+# Buffered structured logging: entries are queued per request and written
+# as a single JSON array by a background thread every LOG_FLUSH_INTERVAL, or
+# by the request thread as soon as LOG_BATCH_SIZE entries are pending
+LOG_FLUSH_INTERVAL = 0.1
+LOG_BATCH_SIZE = 512
+_log_buffer = deque()
+_log_lock = threading.Lock()
+
+def _drain_log_buffer():
+    batch = list(_log_buffer)
+    _log_buffer.clear()
+    return batch
+
+def buffer_log(entry):
+    with _log_lock:
+        _log_buffer.append(entry)
+        if len(_log_buffer) < LOG_BATCH_SIZE:
+            return
+        batch = _drain_log_buffer()
+    logger.info(_dumps(batch).decode())
+
+def flush_logs():
+    with _log_lock:
+        if not _log_buffer:
+            return
+        batch = _drain_log_buffer()
+    logger.info(_dumps(batch).decode())
+
+def _log_flusher():
+    while True:
+        time.sleep(LOG_FLUSH_INTERVAL)
+        flush_logs()
+
+threading.Thread(target=_log_flusher, name='log-flusher', daemon=True).start()
+atexit.register(flush_logs)
+
+# JSON provider backed by orjson (C serializer) instead of stdlib json.
+# Output is always compact with keys in insertion order, regardless of debug mode.
+class OrjsonProvider(JSONProvider):
+    mimetype = 'application/json'
+
+    def dumps(self, obj, **kwargs):
+        return _dumps(obj, option=orjson.OPT_NAIVE_UTC).decode()
+
+    def loads(self, s, **kwargs):
+        return _loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping decode/re-encode
+        obj = self._prepare_response_obj(args, kwargs)
+        body = _dumps(obj, option=orjson.OPT_NAIVE_UTC)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+# Trust X-Forwarded-* headers only when running behind a known number of proxies
+proxy_hops = int(os.getenv('PROXY_FIX_HOPS', 0))
+if proxy_hops:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_hops, x_proto=proxy_hops, x_host=proxy_hops)
 
-# Initialize Prometheus metrics
-metrics = PrometheusMetrics(app)
+# Initialize Prometheus metrics; per-request defaults are replaced by the
+# batched request metrics below
+metrics = PrometheusMetrics(app, export_defaults=False)
 metrics.info('app_info', 'Application info', version='1.0.0')
 
-# In-memory storage
-items = []
+# Batched request metrics: requests are tallied under a local lock and a
+# background thread applies them to the Prometheus collectors once per interval
+METRICS_FLUSH_INTERVAL = 1.0
+request_counter = Counter(
+    'flask_http_request_total', 'Total number of HTTP requests',
+    ['method', 'status', 'path'], registry=metrics.registry
+)
+
+# Request duration histogram whose bucket counts are merged in batches, so a
+# flush takes one lock per label set instead of one observe() per request
+class BatchedHistogram:
+    def __init__(self, name, documentation, labelnames, buckets=Histogram.DEFAULT_BUCKETS):
+        self._name = name
+        self._documentation = documentation
+        self._labelnames = labelnames
+        self._buckets = list(buckets)
+        self._state = {}
+        self._lock = threading.Lock()
+
+    def add(self, labels, durations):
+        counts = [0] * len(self._buckets)
+        for duration in durations:
+            counts[bisect.bisect_left(self._buckets, duration)] += 1
+        total = sum(durations)
+        with self._lock:
+            state = self._state.get(labels)
+            if state is None:
+                self._state[labels] = [counts, total]
+            else:
+                state[0] = [a + b for a, b in zip(state[0], counts)]
+                state[1] += total
+
+    def describe(self):
+        return [HistogramMetricFamily(self._name, self._documentation, labels=self._labelnames)]
+
+    def collect(self):
+        family = HistogramMetricFamily(self._name, self._documentation, labels=self._labelnames)
+        with self._lock:
+            snapshot = [(labels, list(counts), total) for labels, (counts, total) in self._state.items()]
+        for labels, counts, total in snapshot:
+            cumulative = list(itertools.accumulate(counts))
+            buckets = [(floatToGoString(bound), count) for bound, count in zip(self._buckets, cumulative)]
+            family.add_metric(list(labels), buckets, total)
+        yield family
+
+request_duration = BatchedHistogram(
+    'flask_http_request_duration_seconds', 'Flask HTTP request duration in seconds',
+    ['method', 'path', 'status']
+)
+metrics.registry.register(request_duration)
+_metrics_buffer = defaultdict(list)
+_metrics_lock = threading.Lock()
+
+def record_request(method, path, status, duration):
+    with _metrics_lock:
+        _metrics_buffer[(method, path, status)].append(duration)
+
+def flush_metrics():
+    global _metrics_buffer
+    with _metrics_lock:
+        if not _metrics_buffer:
+            return
+        batch = _metrics_buffer
+        _metrics_buffer = defaultdict(list)
+    for (method, path, status), durations in batch.items():
+        request_counter.labels(method, status, path).inc(len(durations))
+        request_duration.add((method, path, str(status)), durations)
+
+def _metrics_flusher():
+    while True:
+        time.sleep(METRICS_FLUSH_INTERVAL)
+        flush_metrics()
+
+threading.Thread(target=_metrics_flusher, name='metrics-flusher', daemon=True).start()
+atexit.register(flush_metrics)
+
+# In-memory storage, indexed by item id (dicts preserve insertion order)
+items: dict[int, dict] = {}
+_next_id = itertools.count(1)
+
+# Cached JSON body for GET /api/items, rebuilt lazily after any write. The
+# generation counter stops a rebuild that raced with a write from storing
+# bytes built from the old items.
+_items_cache_bytes = None
+_items_generation = 0
+_items_cache_lock = threading.Lock()
+
+def invalidate_items_cache():
+    global _items_cache_bytes, _items_generation
+    with _items_cache_lock:
+        _items_generation += 1
+        _items_cache_bytes = None
+
+def clear_items():
+    items.clear()
+    invalidate_items_cache()
+
+# Prebuilt health payload; only the timestamp changes between calls
+_HEALTH_TEMPLATE = b'{"status":"healthy","service":"devops-api","timestamp":"%s"}'
 
 # Middleware for request logging with trace ID
 @app.before_request
 def log_request():
-    trace_id = request.headers.get('X-Trace-ID', str(uuid.uuid4()))
+    trace_id = request.environ.get('HTTP_X_TRACE_ID') or _uuid4().hex
     request.trace_id = trace_id
-    request.start_time = time.time()
+    request.start_time = _monotonic()
     
-    logger.info(json.dumps({
-        'message': 'Incoming request',
-        'method': request.method,
-        'path': request.path,
-        'trace_id': trace_id,
-        'timestamp': datetime.utcnow().isoformat()
-    }))
+    # Skip building the log payload entirely when INFO is filtered out
+    if logger.isEnabledFor(logging.INFO):
+        buffer_log({
+            'message': 'Incoming request',
+            'method': request.method,
+            'path': request.path,
+            'trace_id': trace_id,
+            'timestamp': _iso_now()
+        })
 
 @app.after_request
 def log_response(response):
-    duration = time.time() - request.start_time
-    logger.info(json.dumps({
-        'message': 'Request completed',
-        'method': request.method,
-        'path': request.path,
-        'status_code': response.status_code,
-        'duration_seconds': round(duration, 3),
-        'trace_id': request.trace_id,
-        'timestamp': datetime.utcnow().isoformat()
-    }))
+    # Resolve the request proxy attributes once; they feed both metrics and logs
+    method = request.method
+    path = request.path
+    status_code = response.status_code
+    duration = _monotonic() - request.start_time
+    record_request(method, path, status_code, duration)
+    if logger.isEnabledFor(logging.INFO):
+        buffer_log({
+            'message': 'Request completed',
+            'method': method,
+            'path': path,
+            'status_code': status_code,
+            'duration_seconds': round(duration, 3),
+            'trace_id': request.trace_id,
+            'timestamp': _iso_now()
+        })
     return response
 
 # Root endpoint
@@ -68,46 +280,56 @@ def root():
 # Health check endpoint
 @app.route('/health', methods=['GET'])
 def health():
-    return jsonify({
-        'status': 'healthy',
-        'timestamp': datetime.utcnow().isoformat(),
-        'service': 'devops-api'
-    }), 200
+    body = _HEALTH_TEMPLATE % _iso_now().encode()
+    return Response(body, status=200, mimetype='application/json')
 
 # List all items
 @app.route('/api/items', methods=['GET'])
 def get_items():
-    return jsonify({
-        'items': items,
-        'count': len(items)
-    }), 200
+    global _items_cache_bytes
+    body = _items_cache_bytes
+    if body is None:
+        generation = _items_generation
+        body = _dumps({
+            'items': list(items.values()),
+            'count': len(items)
+        })
+        with _items_cache_lock:
+            if _items_generation == generation:
+                _items_cache_bytes = body
+    return Response(body, status=200, mimetype='application/json')
 
 # Create new item
 @app.route('/api/items', methods=['POST'])
 def create_item():
-    if not request.json or 'name' not in request.json:
+    body = request.get_json()
+    name = body.get('name') if isinstance(body, dict) else None
+    if name is None:
         return jsonify({'error': 'Name is required'}), 400
     
+    item_id = next(_next_id)
     item = {
-        'id': len(items) + 1,
-        'name': request.json['name'],
-        'description': request.json.get('description', ''),
-        'created_at': datetime.utcnow().isoformat()
+        'id': item_id,
+        'name': name,
+        'description': body.get('description', ''),
+        'created_at': _iso_now()
     }
-    items.append(item)
+    items[item_id] = item
+    invalidate_items_cache()
     
-    logger.info(json.dumps({
-        'message': 'Item created',
-        'item_id': item['id'],
-        'trace_id': request.trace_id
-    }))
+    if logger.isEnabledFor(logging.INFO):
+        buffer_log({
+            'message': 'Item created',
+            'item_id': item_id,
+            'trace_id': request.trace_id
+        })
     
     return jsonify(item), 201
 
 # Get single item
 @app.route('/api/items/<int:item_id>', methods=['GET'])
 def get_item(item_id):
-    item = next((item for item in items if item['id'] == item_id), None)
+    item = items.get(item_id)
     if not item:
         return jsonify({'error': 'Item not found'}), 404
     return jsonify(item), 200
@@ -115,27 +337,32 @@ def get_item(item_id):
 # Update item
 @app.route('/api/items/<int:item_id>', methods=['PUT'])
 def update_item(item_id):
-    item = next((item for item in items if item['id'] == item_id), None)
+    item = items.get(item_id)
     if not item:
         return jsonify({'error': 'Item not found'}), 404
     
-    if request.json.get('name'):
-        item['name'] = request.json['name']
-    if request.json.get('description'):
-        item['description'] = request.json['description']
-    item['updated_at'] = datetime.utcnow().isoformat()
+    body = request.get_json()
+    if not isinstance(body, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    
+    name = body.get('name')
+    if name:
+        item['name'] = name
+    description = body.get('description')
+    if description:
+        item['description'] = description
+    item['updated_at'] = _iso_now()
+    invalidate_items_cache()
     
     return jsonify(item), 200
 
 # Delete item
 @app.route('/api/items/<int:item_id>', methods=['DELETE'])
 def delete_item(item_id):
-    global items
-    item = next((item for item in items if item['id'] == item_id), None)
-    if not item:
+    if items.pop(item_id, None) is None:
         return jsonify({'error': 'Item not found'}), 404
     
-    items = [i for i in items if i['id'] != item_id]
+    invalidate_items_cache()
     return jsonify({'message': 'Item deleted', 'id': item_id}), 200
 
 # Error handlers
@@ -149,4 +376,9 @@ def internal_error(error):
 
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=False)  # nosec B104
\ No newline at end of file
+    if os.getenv('USE_BJOERN') == '1':
+        # Opt-in C WSGI server; not in requirements because it needs libev to build
+        import bjoern
+        bjoern.run(app, '0.0.0.0', port)  # nosec B104
+    else:
+        app.run(host='0.0.0.0', port=port, debug=False)  # nosec B104
\ No newline at end of file
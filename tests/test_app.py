@@ -4,15 +4,16 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.app import app, items  # ADD items here
+import src.app as app_module
+from src.app import app, buffer_log, clear_items, flush_logs, flush_metrics
 
 @pytest.fixture
 def client():
     app.config['TESTING'] = True
     with app.test_client() as client:
-        items.clear()  # Clear before each test
+        clear_items()  # Clear before each test
         yield client
-        items.clear()  # Clear after each test
+        clear_items()  # Clear after each test
 
 def test_health_check(client):
     """Test health endpoint"""
@@ -41,6 +42,31 @@ def test_create_item(client):
     assert data['description'] == 'A test'
     assert 'id' in data
 
+def test_get_items_reflects_writes(client):
+    """Test that the cached item list is refreshed after create and delete"""
+    client.get('/api/items')
+    create_response = client.post('/api/items',
+                                  data=json.dumps({'name': 'Cached'}),
+                                  content_type='application/json')
+    item_data = json.loads(create_response.data)
+    data = json.loads(client.get('/api/items').data)
+    assert data['count'] == 1
+    assert data['items'][0]['name'] == 'Cached'
+
+    client.delete(f'/api/items/{item_data["id"]}')
+    data = json.loads(client.get('/api/items').data)
+    assert data['count'] == 0
+
+def test_jsonify_uses_orjson_bytes_directly(client, monkeypatch):
+    """Test that jsonify builds the response from orjson bytes, not the str dumps()"""
+    def fail_dumps(obj, **kwargs):
+        raise AssertionError('dumps() should not be used for responses')
+    monkeypatch.setattr(app.json, 'dumps', fail_dumps)
+    response = client.get('/')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    assert json.loads(response.data)['message'] == 'DevOps API is running'
+
 def test_create_item_without_name(client):
     """Test creating item without required name field"""
     response = client.post('/api/items',
@@ -50,6 +76,24 @@ def test_create_item_without_name(client):
     data = json.loads(response.data)
     assert 'error' in data
 
+def test_create_item_with_non_object_body(client):
+    """Test creating item with valid JSON that is not an object"""
+    for payload in ('"abc"', '[1]'):
+        response = client.post('/api/items',
+                              data=payload,
+                              content_type='application/json')
+        assert response.status_code == 400
+        assert json.loads(response.data)['error'] == 'Name is required'
+
+    response = client.post('/api/items',
+                          data='{bad',
+                          content_type='application/json')
+    assert response.status_code == 400
+    response = client.post('/api/items',
+                          data='name=Test',
+                          content_type='text/plain')
+    assert response.status_code == 415
+
 def test_get_single_item(client):
     """Test getting a single item"""
     # Create an item first
@@ -87,6 +131,29 @@ def test_update_item(client):
     data = json.loads(response.data)
     assert data['name'] == 'Updated'
 
+def test_update_item_with_invalid_body(client):
+    """Test that updating with a malformed or non-object body is rejected"""
+    create_response = client.post('/api/items',
+                                  data=json.dumps({'name': 'Original'}),
+                                  content_type='application/json')
+    item_data = json.loads(create_response.data)
+
+    response = client.put(f'/api/items/{item_data["id"]}',
+                         data='{bad',
+                         content_type='application/json')
+    assert response.status_code == 400
+    response = client.put(f'/api/items/{item_data["id"]}',
+                         data='[1]',
+                         content_type='application/json')
+    assert response.status_code == 400
+    response = client.put(f'/api/items/{item_data["id"]}',
+                         data='name=Updated',
+                         content_type='text/plain')
+    assert response.status_code == 415
+
+    response = client.get(f'/api/items/{item_data["id"]}')
+    assert 'updated_at' not in json.loads(response.data)
+
 def test_update_nonexistent_item(client):
     """Test updating an item that doesn't exist"""
     response = client.put('/api/items/999',
@@ -110,6 +177,24 @@ def test_delete_item(client):
     response = client.get(f'/api/items/{item_data["id"]}')
     assert response.status_code == 404
 
+def test_item_ids_not_reused_after_delete(client):
+    """Test that new items never reuse the id of a deleted item"""
+    first = json.loads(client.post('/api/items',
+                                   data=json.dumps({'name': 'First'}),
+                                   content_type='application/json').data)
+    second = json.loads(client.post('/api/items',
+                                    data=json.dumps({'name': 'Second'}),
+                                    content_type='application/json').data)
+    client.delete(f'/api/items/{first["id"]}')
+
+    third = json.loads(client.post('/api/items',
+                                   data=json.dumps({'name': 'Third'}),
+                                   content_type='application/json').data)
+    assert third['id'] not in (first['id'], second['id'])
+
+    response = client.get(f'/api/items/{second["id"]}')
+    assert json.loads(response.data)['name'] == 'Second'
+
 def test_delete_nonexistent_item(client):
     """Test deleting an item that doesn't exist"""
     response = client.delete('/api/items/999')
@@ -118,4 +203,36 @@ def test_delete_nonexistent_item(client):
 def test_logging_with_trace_id(client):
     """Test that requests include trace IDs"""
     response = client.get('/health', headers={'X-Trace-ID': 'test-trace-123'})
-    assert response.status_code == 200
\ No newline at end of file
+    assert response.status_code == 200
+
+def test_request_logs_are_flushed_in_batches(client, caplog):
+    """Test that buffered request logs are written as one JSON array"""
+    with caplog.at_level('INFO', logger='src.app'):
+        client.get('/health', headers={'X-Trace-ID': 'batch-trace-1'})
+        client.get('/health', headers={'X-Trace-ID': 'batch-trace-2'})
+        flush_logs()
+    batches = [json.loads(r.getMessage()) for r in caplog.records]
+    entries = [e for batch in batches for e in batch]
+    trace_ids = {e['trace_id'] for e in entries}
+    assert {'batch-trace-1', 'batch-trace-2'} <= trace_ids
+
+def test_request_metrics_are_flushed(client):
+    """Test that batched request counts reach the metrics endpoint"""
+    client.get('/health')
+    flush_metrics()
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    body = response.data.decode()
+    assert 'flask_http_request_total{method="GET",path="/health",status="200"}' in body
+    assert 'flask_http_request_duration_seconds_bucket{le="+Inf",method="GET",path="/health",status="200"}' in body
+    assert 'flask_http_request_duration_seconds_count{method="GET",path="/health",status="200"}' in body
+
+def test_log_buffer_flushes_when_full(caplog, monkeypatch):
+    """Test that a full log buffer is flushed instead of dropping entries"""
+    monkeypatch.setattr(app_module, 'LOG_BATCH_SIZE', 3)
+    flush_logs()
+    with caplog.at_level('INFO', logger='src.app'):
+        for i in range(3):
+            buffer_log({'message': 'burst', 'seq': i})
+    entries = [e for r in caplog.records for e in json.loads(r.getMessage())]
+    assert [e['seq'] for e in entries if e.get('message') == 'burst'] == [0, 1, 2]